@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of Github client tail latency against a fault injecting stub.
+
+The stub server answers user lookups, hanging on some requests and failing
+others with 503, and the same calls are timed with the default client and
+with the client tuned through gitsuggest.client.
+
+Usage from git root:
+
+    >>> PYTHONPATH=. python benchmarks/bench_client.py --calls 200
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import github
+
+from gitsuggest.client import get_client_options
+
+
+class FaultyHandler(BaseHTTPRequestHandler):
+    """Request handler which hangs or fails on a share of requests."""
+
+    hang_rate = 0.02
+    hang_seconds = 5.0
+    error_rate = 0.05
+
+    def do_GET(self):
+        roll = random.random()
+        if roll < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        elif roll < self.hang_rate + self.error_rate:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"login": self.path.rsplit("/", 1)[-1]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+def run(base_url, options, calls, workers):
+    """Method to time user lookups against the stub.
+
+    :return: Tuple of sorted latencies and count of failed calls.
+    """
+    handle = github.Github(
+        base_url=base_url, seconds_between_requests=0, **options
+    )
+    failures = [0]
+
+    def call(i):
+        started_at = time.time()
+        try:
+            handle.get_user("user{}".format(i))
+        except Exception:
+            failures[0] += 1
+        return time.time() - started_at
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = sorted(executor.map(call, range(calls)))
+
+    return latencies, failures[0]
+
+
+def percentile(latencies, pct):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--timeout", type=int, default=1)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--retry_deadline", type=float, default=3.0)
+    arguments = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = "http://127.0.0.1:{}".format(server.server_port)
+
+    configurations = [
+        ("default", {}),
+        (
+            "tuned",
+            get_client_options(
+                timeout=arguments.timeout,
+                pool_size=arguments.workers,
+                retries=arguments.retries,
+                retry_deadline=arguments.retry_deadline,
+            ),
+        ),
+    ]
+
+    for name, options in configurations:
+        latencies, failures = run(
+            base_url, options, arguments.calls, arguments.workers
+        )
+        print(
+            "{:8} p50 {:.3f}s  p99 {:.3f}s  max {:.3f}s  failed {}".format(
+                name,
+                percentile(latencies, 0.50),
+                percentile(latencies, 0.99),
+                latencies[-1],
+                failures,
+            )
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of peak memory while building and training LDA on a large corpus.
+
+Synthetic tokenized descriptions resembling a deep dive go through the whole
+pipeline GitSuggest runs: tokens, dictionary, corpus and training with 10
+passes. The corpus is held as a list of bag of words along with the tokens,
+as GitSuggest used to, or serialized to an MmCorpus streamed while training
+once the tokens are released, as GitSuggest does now.
+
+Usage from git root:
+
+    >>> python benchmarks/bench_corpus.py --docs 100000
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from os import path
+
+from gensim import corpora, models
+
+
+def get_documents(count, vocabulary, length):
+    """Method to procure random tokenized documents."""
+    words = ["word{}".format(i) for i in range(vocabulary)]
+    return [random.sample(words, length) for _ in range(count)]
+
+
+def train_in_memory(arguments):
+    documents = get_documents(
+        arguments.docs, arguments.vocabulary, arguments.length
+    )
+    dictionary = corpora.Dictionary(documents)
+    corpus = [dictionary.doc2bow(text) for text in documents]
+    return models.ldamodel.LdaModel(
+        corpus, num_topics=1, id2word=dictionary, passes=arguments.passes
+    )
+
+
+def train_streamed(arguments):
+    documents = get_documents(
+        arguments.docs, arguments.vocabulary, arguments.length
+    )
+    dictionary = corpora.Dictionary(documents)
+    corpus_dir = tempfile.mkdtemp(prefix="gitsuggest")
+    try:
+        corpus_file = path.join(corpus_dir, "corpus.mm")
+        corpora.MmCorpus.serialize(
+            corpus_file, (dictionary.doc2bow(text) for text in documents)
+        )
+        corpus = corpora.MmCorpus(corpus_file)
+        del documents
+        return models.ldamodel.LdaModel(
+            corpus,
+            num_topics=1,
+            id2word=dictionary,
+            passes=arguments.passes,
+        )
+    finally:
+        shutil.rmtree(corpus_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--length", type=int, default=12)
+    parser.add_argument("--passes", type=int, default=10)
+    arguments = parser.parse_args()
+
+    for name, train in [
+        ("list", train_in_memory),
+        ("mmcorpus", train_streamed),
+    ]:
+        # Same documents for both, generated within the measurement.
+        random.seed(0)
+        tracemalloc.start()
+        started_at = time.time()
+        train(arguments)
+        elapsed = time.time() - started_at
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            "{:8} peak {:.1f} MiB  time {:.1f}s".format(
+                name, peak / float(1024 * 1024), elapsed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,5 +25,8 @@ __author_email__ = "sharma.vishwas88@gmail.com"
 __license__ = "MIT"
 __copyright__ = "Copyright 2017 Vishwas B Sharma"
 
+from .cache import TokenCache
+from .index import CandidateIndex
 from .suggest import GitSuggest
+from .sync import StarSync
 from .utilities import ReposToHTML
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.cache
+~~~~~~~~~~~~~~~~
+
+This module contains caches shared across GitSuggest instances.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class TokenCache(object):
+    """Content addressed LRU cache from repository description to its cleaned
+    tokens.
+
+    Popular repositories show up in the interests of a lot of users, so the
+    cache is meant to be shared across GitSuggest instances. Entries are keyed
+    by a hash of the description and evicted least recently used first once
+    their accounted size goes beyond the configured limit.
+    """
+
+    # Default upper bound on accounted memory of the cache, in bytes.
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        """Constructor.
+
+        :param max_bytes: Upper bound on accounted memory of cached entries.
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get_key(description):
+        """Method to procure the cache key for a description.
+
+        :param description: Repository description.
+        :return: Hex digest identifying the description.
+        """
+        return hashlib.sha1(description.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_entry_size(key, tokens):
+        """Method to approximate memory held by a cache entry.
+
+        :param key: Cache key.
+        :param tokens: Tuple of tokens.
+        :return: Approximate size of the entry in bytes.
+        """
+        return (
+            sys.getsizeof(key)
+            + sys.getsizeof(tokens)
+            + sum(sys.getsizeof(tok) for tok in tokens)
+        )
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, description):
+        """Method to procure cleaned tokens of a description.
+
+        :param description: Repository description.
+        :return: Tuple of tokens or None if description is not cached.
+        """
+        key = TokenCache.get_key(description)
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            # Re-insert to mark the entry as most recently used.
+            self.__entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, description, tokens):
+        """Method to cache cleaned tokens of a description.
+
+        :param description: Repository description.
+        :param tokens: Cleaned tokens of the description.
+        """
+        self.__put(TokenCache.get_key(description), tuple(tokens))
+
+    def __put(self, key, tokens):
+        """Method to insert an entry and evict entries over the limit.
+
+        :param key: Cache key.
+        :param tokens: Tuple of tokens.
+        """
+        size = TokenCache.get_entry_size(key, tokens)
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+
+            # Entries larger than the whole cache are not worth keeping.
+            if size > self.max_bytes:
+                return
+
+            self.__entries[key] = (tokens, size)
+            self.size_bytes += size
+
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+
+    def clear(self):
+        """Method to drop all cached entries."""
+        with self.__lock:
+            self.__entries.clear()
+            self.size_bytes = 0
+
+    def save(self, write_to):
+        """Method to persist the cache to a JSON file.
+
+        Entries are written least recently used first so that loading them
+        back preserves the eviction order. The file is replaced at once so
+        that an interrupted save leaves the previous cache intact.
+
+        :param write_to: File/Path to write the cache to.
+        """
+        with self.__lock:
+            entries = [
+                [key, list(tokens)]
+                for key, (tokens, _) in self.__entries.items()
+            ]
+
+        fd, partial_file = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(write_to)), suffix=".partial"
+        )
+        try:
+            with os.fdopen(fd, "w") as writefile:
+                json.dump(entries, writefile)
+            os.replace(partial_file, write_to)
+        except BaseException:
+            os.remove(partial_file)
+            raise
+
+    @classmethod
+    def load(cls, read_from, max_bytes=MAX_BYTES):
+        """Method to create a cache from a file written by save().
+
+        :param read_from: File/Path to read the cache from.
+        :param max_bytes: Upper bound on accounted memory of cached entries.
+        :return: TokenCache populated with the persisted entries.
+        """
+        cache = cls(max_bytes=max_bytes)
+
+        with open(read_from, "r") as readfile:
+            for key, tokens in json.load(readfile):
+                cache.__put(key, tuple(tokens))
+
+        return cache
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.client
+~~~~~~~~~~~~~~~~~
+
+This module contains code to tune the Github client used by GitSuggest.
+"""
+
+import random
+import time
+
+from github import GithubRetry
+
+
+class StageBudget(object):
+    """Class to hold the deadline shared by all Github calls of a stage, like
+    populating repositories of interest or searching for suggestions.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.ends_at = None
+
+    def start(self, seconds):
+        """Method to start a stage.
+
+        :param seconds: Seconds the stage may take, None for no limit.
+        """
+        self.ends_at = None if seconds is None else time.time() + seconds
+
+    def stop(self):
+        """Method to end a stage, lifting its limit."""
+        self.ends_at = None
+
+    def get_remaining(self):
+        """Method to procure the time left for the stage.
+
+        :return: Seconds left or None if the stage has no limit.
+        """
+        if self.ends_at is None:
+            return None
+        return self.ends_at - time.time()
+
+    def is_exhausted(self):
+        """Method to check if the stage is out of time.
+
+        :return: True if the stage has a limit and it is past it.
+        """
+        remaining = self.get_remaining()
+        return remaining is not None and remaining <= 0
+
+
+class JitteredRetry(GithubRetry):
+    """Retry policy with full jitter on backoff, a deadline on the time spent
+    retrying a single call and a budget shared by the calls of a stage.
+
+    Jitter keeps concurrent callers which failed together from retrying in
+    lockstep. Waits between attempts, rate limit waits and Retry-After
+    included, are cut short at the deadline or the end of the stage budget,
+    whichever is earlier, after which the call is not retried anymore. A call
+    can hence take at most one more attempt beyond them.
+    """
+
+    def __init__(self, deadline=None, budget=None, started_at=None, **kwargs):
+        """Constructor.
+
+        :param deadline: Seconds after the first failure of a call beyond
+                         which it is not retried anymore.
+        :param budget: StageBudget shared by the calls of a stage.
+        :param started_at: Time of the first failure, set on retries.
+        :param kwargs: Arguments to github.GithubRetry.
+        """
+        super(JitteredRetry, self).__init__(**kwargs)
+        self.deadline = deadline
+        self.budget = budget
+        self.started_at = started_at
+
+    def new(self, **kwargs):
+        """Method to create the retry state for the next attempt."""
+        kwargs.setdefault("deadline", self.deadline)
+        kwargs.setdefault("budget", self.budget)
+        kwargs.setdefault("started_at", self.started_at or time.time())
+        return super(JitteredRetry, self).new(**kwargs)
+
+    def get_backoff_time(self):
+        """Method to procure a random backoff up to the exponential one."""
+        return random.uniform(0, super(JitteredRetry, self).get_backoff_time())
+
+    def get_remaining(self):
+        """Method to procure the time left before retries have to stop.
+
+        :return: Seconds left or None if neither deadline nor budget apply.
+        """
+        limits = list()
+        if self.deadline is not None and self.started_at is not None:
+            limits.append(self.started_at + self.deadline - time.time())
+        if self.budget is not None:
+            limits.append(self.budget.get_remaining())
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if limits else None
+
+    def is_exhausted(self):
+        """Method to check if the call should not be retried anymore."""
+        remaining = self.get_remaining()
+        if remaining is not None and remaining <= 0:
+            return True
+        return super(JitteredRetry, self).is_exhausted()
+
+    def sleep(self, response=None):
+        """Method to wait before the next attempt, no longer than the time
+        left before retries have to stop.
+
+        :param response: Response of the failed attempt, if any.
+        """
+        remaining = self.get_remaining()
+        if remaining is None:
+            return super(JitteredRetry, self).sleep(response)
+
+        # Rate limit waits of GithubRetry replace get_backoff_time().
+        backoff = self.get_backoff_time()
+        if self.respect_retry_after_header and response is not None:
+            backoff = self.get_retry_after(response) or backoff
+
+        backoff = min(backoff, remaining)
+        if backoff > 0:
+            time.sleep(backoff)
+
+
+def get_client_options(
+    timeout=None,
+    pool_size=None,
+    retries=None,
+    retry_deadline=None,
+    budget=None,
+    backoff_factor=0.5,
+):
+    """Method to procure keyword arguments for github.Github.
+
+    Options left as None keep the defaults of github.Github.
+
+    :param timeout: Seconds to wait for a connection and for each read.
+    :param pool_size: Count of connections kept open for concurrent calls.
+    :param retries: Count of retries on connection errors, 5xx responses and
+                    rate limits, defaults to the one of GithubRetry.
+    :param retry_deadline: Seconds after the first failure of a call beyond
+                           which it is not retried anymore.
+    :param budget: StageBudget shared by the calls of a stage.
+    :param backoff_factor: Factor for the exponential backoff between retries.
+    :return: Dictionary of keyword arguments.
+    """
+    options = dict()
+
+    if timeout is not None:
+        options["timeout"] = timeout
+
+    if pool_size is not None:
+        options["pool_size"] = pool_size
+
+    if retries is not None or retry_deadline is not None or budget is not None:
+        retry_options = dict(
+            deadline=retry_deadline,
+            budget=budget,
+            backoff_factor=backoff_factor,
+            # Let the client raise its own exception on the last response.
+            raise_on_status=False,
+        )
+        # Count of retries is left to GithubRetry when not given.
+        if retries is not None:
+            retry_options["total"] = retries
+        options["retry"] = JitteredRetry(**retry_options)
+
+    return options
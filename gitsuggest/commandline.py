@@ -10,7 +10,12 @@ This module contains code to use the GitSuggest as commandline.
 Usage:
 
     >>> gitsuggest --help
-    usage: gitsuggest [-h] username
+    usage: gitsuggest [-h] [--deep_dive] [--sync_dir SYNC_DIR] [--index INDEX]
+                      [--timeout TIMEOUT] [--pool_size POOL_SIZE]
+                      [--retries RETRIES] [--retry_deadline RETRY_DEADLINE]
+                      [--stage_timeout STAGE_TIMEOUT]
+                      [--token_cache TOKEN_CACHE]
+                      username
 
     positional arguments:
       username    Github Username
@@ -20,20 +25,54 @@ Usage:
       --deep_dive  If added considers repositories starred by users you follow
                    along with repositories you have starred. Is significantly
                    slower.
+      --sync_dir SYNC_DIR  Directory to keep starred repositories in so that
+                           later runs only fetch newly starred ones.
+      --index INDEX  Candidate index built by gitsuggest-index to answer
+                     queries from before searching Github. Queries requested
+                     are logged to INDEX.requests for the next crawl.
+      --timeout TIMEOUT  Seconds to wait for a connection and for each read
+                         from Github.
+      --pool_size POOL_SIZE  Count of connections to Github kept open.
+      --retries RETRIES  Count of retries on connection errors, 5xx responses
+                         and rate limits.
+      --retry_deadline RETRY_DEADLINE  Seconds after the first failure of a
+                                       call beyond which it is not retried.
+      --stage_timeout STAGE_TIMEOUT  Seconds each of fetching starred
+                                     repositories and searching may spend.
+      --token_cache TOKEN_CACHE  File to load cleaned description tokens
+                                 from and save them to after the run.
 
     >>> gitsuggest <username>
     # Asks for password input in a secure way to fetch suggested repositories
     # for the authenticated user.
+
+    >>> gitsuggest-index [--token TOKEN] <index> [queries [queries ...]]
+    # Crawls the most starred repositories for the queries along with the
+    # ones requested from the index within the last week, and rebuilds the
+    # candidate index. Meant to be run periodically, the access token is
+    # taken from GITHUB_TOKEN when --token is not given.
 """
 
 import argparse
 import getpass
+import os
+import sys
+import time
 import webbrowser
+from os import path
 
 import crayons
-from github.GithubException import BadCredentialsException, TwoFactorException
+import github
+from github.GithubException import (
+    BadCredentialsException,
+    GithubException,
+    TwoFactorException,
+)
 
+from .cache import TokenCache
+from .index import CandidateIndex
 from .suggest import GitSuggest
+from .sync import StarSync
 from .utilities import ReposToHTML
 
 
@@ -59,6 +98,89 @@ def main():
         default=False,
     )
 
+    parser.add_argument(
+        "--sync_dir",
+        help=" ".join(
+            [
+                "Directory to keep starred repositories in so that",
+                "later runs only fetch newly starred ones.",
+            ]
+        ),
+        default=None,
+    )
+
+    parser.add_argument(
+        "--index",
+        help=" ".join(
+            [
+                "Candidate index built by gitsuggest-index to answer",
+                "queries from before searching Github.",
+            ]
+        ),
+        default=None,
+    )
+
+    parser.add_argument(
+        "--timeout",
+        help="Seconds to wait for a connection and for each read from Github.",
+        type=int,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--pool_size",
+        help="Count of connections to Github kept open.",
+        type=int,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--retries",
+        help=" ".join(
+            [
+                "Count of retries on connection errors, 5xx responses",
+                "and rate limits.",
+            ]
+        ),
+        type=int,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--retry_deadline",
+        help=" ".join(
+            [
+                "Seconds after the first failure of a call beyond which",
+                "it is not retried.",
+            ]
+        ),
+        type=float,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--stage_timeout",
+        help=" ".join(
+            [
+                "Seconds each of fetching starred repositories and",
+                "searching may spend.",
+            ]
+        ),
+        type=float,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--token_cache",
+        help=" ".join(
+            [
+                "File to load cleaned description tokens from and save",
+                "them to after the run.",
+            ]
+        ),
+        default=None,
+    )
+
     # Parse command line arguments.
     arguments = parser.parse_args()
 
@@ -86,12 +208,38 @@ def main():
         )
     )
 
+    candidate_index = None
+    if arguments.index is not None:
+        candidate_index = (
+            CandidateIndex.load(arguments.index)
+            if path.isfile(arguments.index)
+            else CandidateIndex()
+        )
+
+    token_cache = None
+    if arguments.token_cache is not None:
+        token_cache = (
+            TokenCache.load(arguments.token_cache)
+            if path.isfile(arguments.token_cache)
+            else TokenCache()
+        )
+
     try:
         gs = GitSuggest(
             username=arguments.username,
             password=password,
             token=None,
             deep_dive=arguments.deep_dive,
+            star_sync=(
+                StarSync(arguments.sync_dir) if arguments.sync_dir else None
+            ),
+            candidate_index=candidate_index,
+            timeout=arguments.timeout,
+            pool_size=arguments.pool_size,
+            retries=arguments.retries,
+            retry_deadline=arguments.retry_deadline,
+            stage_timeout=arguments.stage_timeout,
+            token_cache=token_cache,
         )
     except BadCredentialsException:
         print("")
@@ -123,11 +271,117 @@ def main():
     file_name = "/tmp/gitresults.html"
     repos = list(gs.get_suggested_repositories())
 
+    if token_cache is not None:
+        token_cache.save(arguments.token_cache)
+
+    # Record queries requested from the index for the next crawl. Only the
+    # requests log is appended to, the index is left to gitsuggest-index.
+    if candidate_index is not None and candidate_index.requests:
+        candidate_index.save_requests(arguments.index + ".requests")
+
     r2h = ReposToHTML(arguments.username, repos)
     r2h.to_html(file_name)
 
     webbrowser.open_new("file://" + file_name)
 
 
+def build_index():
+    """Starting point for the candidate index crawler."""
+
+    # Create command line parser.
+    parser = argparse.ArgumentParser()
+
+    # Adding command line arguments.
+    parser.add_argument("index", help="File to write the candidate index to")
+
+    parser.add_argument(
+        "queries",
+        help=" ".join(
+            [
+                "Queries to crawl along with the ones requested from the",
+                "index recently",
+            ]
+        ),
+        nargs="*",
+    )
+
+    parser.add_argument(
+        "--token",
+        help=" ".join(
+            [
+                "Github access token, defaults to GITHUB_TOKEN environment",
+                "variable and is asked for if neither is set",
+            ]
+        ),
+        default=os.environ.get("GITHUB_TOKEN"),
+    )
+
+    # Parse command line arguments.
+    arguments = parser.parse_args()
+
+    index = CandidateIndex()
+    if path.isfile(arguments.index):
+        index = CandidateIndex.load(arguments.index)
+
+    # Requests logged by suggestion runs are moved aside before merging, so
+    # that runs appending meanwhile start a new log. The moved log is only
+    # removed once merged requests are saved in the index.
+    requests_file = arguments.index + ".requests"
+    merging_file = requests_file + ".merging"
+    if not path.isfile(merging_file) and path.isfile(requests_file):
+        os.replace(requests_file, merging_file)
+    if path.isfile(merging_file):
+        index.add_requests(CandidateIndex.load_requests(merging_file))
+
+    # Queries given on command line count as requested now.
+    now = time.time()
+    index.add_requests(dict((query, now) for query in arguments.queries))
+
+    queries = index.get_queries_to_crawl()
+    if not queries:
+        parser.print_help()
+        return
+
+    token = arguments.token
+    if token is None and sys.stdin.isatty():
+        token = getpass.getpass(
+            crayons.blue(
+                " ".join(
+                    [
+                        "Enter access token (to skip press enter",
+                        "without entering anything): ",
+                    ]
+                ),
+                bold=True,
+            )
+        )
+
+    try:
+        index.crawl(
+            github.Github(token) if token else github.Github(), queries
+        )
+        crawl_error = None
+    except GithubException as e:
+        # The index is left as it was, only merged requests are saved.
+        crawl_error = e
+
+    index.save(arguments.index)
+    if path.isfile(merging_file):
+        os.remove(merging_file)
+
+    print("")
+    if crawl_error is not None:
+        print(crayons.red("Crawl failed: {}".format(crawl_error), bold=True))
+        exit(1)
+
+    print(
+        crayons.green(
+            "Indexed {} repositories for {} queries.".format(
+                len(index.repos), len(index.queries)
+            )
+        )
+    )
+
+
 if __name__ == "__main__":
     main()
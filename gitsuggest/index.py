@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.index
+~~~~~~~~~~~~~~~~
+
+This module contains a local index of candidate repositories which can answer
+suggestion queries without spending search API quota.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from collections import defaultdict, namedtuple
+
+# Record of an indexed repository holding what is needed to present it.
+IndexedRepository = namedtuple(
+    "IndexedRepository",
+    ["full_name", "description", "language", "stargazers_count"],
+)
+
+
+class CandidateIndex(object):
+    """Class to hold candidate repositories for search queries along with an
+    inverted index from terms to those repositories.
+
+    The index is built offline by crawling the most starred repositories for
+    the queries requested recently, see crawl(). Queries generated by
+    GitSuggest repeat a lot, so they are answered from the page crawled for
+    the very same query. Other queries are answered from the repositories
+    matching all of their terms only if every term was crawled on its own and
+    a full page matches. Everything else is left to live search.
+
+    Every query searched is recorded in requests, which the suggestion path
+    appends to a log with save_requests() and the crawler merges with
+    add_requests(). Queries not requested within the query time to live are
+    no longer crawled.
+    """
+
+    # Seconds after which the index is considered stale and not used.
+    MAX_AGE = 24 * 60 * 60
+
+    # Seconds after their last request beyond which queries are not crawled.
+    QUERY_TTL = 7 * 24 * 60 * 60
+
+    # Count of repositories in a single page of search results.
+    PAGE_SIZE = 30
+
+    # Regular expression to split names and descriptions into terms.
+    TERM_RE = re.compile(r"[a-z]+")
+
+    def __init__(self, max_age=MAX_AGE, query_ttl=QUERY_TTL):
+        """Constructor.
+
+        :param max_age: Seconds after which the index is considered stale.
+        :param query_ttl: Seconds after their last request beyond which
+                          queries are not crawled.
+        """
+        self.max_age = max_age
+        self.query_ttl = query_ttl
+        self.built_at = None
+        # Crawled queries to names of repositories found for them.
+        self.queries = dict()
+        # Queries to the time they were last requested.
+        self.requested = dict()
+        # Queries to the time they were requested from this index.
+        self.requests = dict()
+        self.repos = dict()
+        self.postings = defaultdict(set)
+
+    @staticmethod
+    def get_key(query):
+        """Method to normalize a query.
+
+        :param query: Space separated terms as sent to live search.
+        :return: Lowercased query with single spaces between terms.
+        """
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def get_postings(repos):
+        """Method to build the inverted index from terms to repositories.
+
+        :param repos: Iterable of IndexedRepository.
+        :return: Dictionary from term to set of repository names.
+        """
+        postings = defaultdict(set)
+        for repo in repos:
+            text = " ".join([repo.full_name, repo.description or ""])
+            for term in CandidateIndex.TERM_RE.findall(text.lower()):
+                postings[term].add(repo.full_name)
+        return postings
+
+    def add_requests(self, requests):
+        """Method to merge times queries were requested at.
+
+        :param requests: Dictionary from query to time it was requested at.
+        """
+        for query, requested_at in requests.items():
+            key = CandidateIndex.get_key(query)
+            if key and requested_at > self.requested.get(key, 0):
+                self.requested[key] = requested_at
+
+    def get_queries_to_crawl(self):
+        """Method to procure queries requested within the query time to live,
+        forgetting the ones requested before it.
+
+        :return: Sorted list of queries.
+        """
+        now = time.time()
+        self.requested = dict(
+            (key, requested_at)
+            for key, requested_at in self.requested.items()
+            if now - requested_at < self.query_ttl
+        )
+        return sorted(self.requested)
+
+    def crawl(self, github_handle, queries):
+        """Method to rebuild the index with the most starred repositories for
+        each of the queries.
+
+        Repositories and terms are rebuilt from the crawled pages alone, so
+        repositories which dropped out of them and terms which are no longer
+        in their descriptions are not kept. If a search fails the index is
+        left as it was.
+
+        IMPORTANT NOTE: This spends one search call per query, run it from a
+        periodic job and not from the suggestion path.
+
+        :param github_handle: github.Github handle to search with.
+        :param queries: Iterable of queries to crawl.
+        """
+        crawled_queries = dict()
+        repos = dict()
+        for query in queries:
+            key = CandidateIndex.get_key(query)
+            full_names = list()
+            for repo in github_handle.search_repositories(
+                key, "stars", "desc"
+            ).get_page(0):
+                repos[repo.full_name] = IndexedRepository(
+                    repo.full_name,
+                    repo.description,
+                    repo.language,
+                    repo.stargazers_count,
+                )
+                full_names.append(repo.full_name)
+            crawled_queries[key] = full_names
+
+        self.queries = crawled_queries
+        self.repos = repos
+        self.postings = CandidateIndex.get_postings(repos.values())
+        self.built_at = time.time()
+
+    def is_stale(self):
+        """Method to check if the index is too old to be used.
+
+        :return: True if the index was never built or is older than max age.
+        """
+        return (
+            self.built_at is None
+            or time.time() - self.built_at >= self.max_age
+        )
+
+    def search(self, query):
+        """Method to procure repositories for the query from the index.
+
+        :param query: Space separated terms as sent to live search.
+        :return: List of IndexedRepository, highly starred first, or None if
+                 the index cannot answer the query.
+        """
+        key = CandidateIndex.get_key(query)
+        if not key:
+            return None
+
+        self.requests[key] = time.time()
+        if self.is_stale():
+            return None
+
+        if key in self.queries:
+            full_names = self.queries[key]
+        else:
+            # Repositories matching all of the terms crawled on their own.
+            terms = key.split()
+            full_names = set()
+            if all(term in self.queries for term in terms):
+                full_names = set.intersection(
+                    *[self.postings.get(term, set()) for term in terms]
+                )
+
+            # A partial page would hide repositories live search finds.
+            if len(full_names) < CandidateIndex.PAGE_SIZE:
+                return None
+
+        repos = sorted(
+            (self.repos[full_name] for full_name in full_names),
+            key=lambda repo: repo.stargazers_count,
+            reverse=True,
+        )
+        return repos[: CandidateIndex.PAGE_SIZE]
+
+    def save_requests(self, append_to):
+        """Method to append the queries requested from this index to a log.
+
+        Only the log is written to, so that concurrent suggestion runs never
+        overwrite the index or each other's requests.
+
+        :param append_to: File/Path of the log to append requests to.
+        """
+        lines = [
+            json.dumps([requested_at, key]) + "\n"
+            for key, requested_at in sorted(self.requests.items())
+        ]
+        with open(append_to, "a") as appendfile:
+            appendfile.write("".join(lines))
+
+    @staticmethod
+    def load_requests(read_from):
+        """Method to read a log written by save_requests().
+
+        Lines cut short by an interrupted write are skipped.
+
+        :param read_from: File/Path of the log to read requests from.
+        :return: Dictionary from query to time it was last requested at.
+        """
+        requests = dict()
+        with open(read_from, "r") as readfile:
+            for line in readfile:
+                try:
+                    requested_at, key = json.loads(line)
+                except ValueError:
+                    continue
+                requests[key] = max(requested_at, requests.get(key, 0))
+        return requests
+
+    def save(self, write_to):
+        """Method to persist the index to a JSON file.
+
+        The file is replaced at once so that readers never see a partially
+        written index.
+
+        :param write_to: File/Path to write the index to.
+        """
+        fd, partial_file = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(write_to)), suffix=".partial"
+        )
+        try:
+            with os.fdopen(fd, "w") as writefile:
+                json.dump(
+                    {
+                        "built_at": self.built_at,
+                        "queries": self.queries,
+                        "requested": self.requested,
+                        "repos": [list(repo) for repo in self.repos.values()],
+                    },
+                    writefile,
+                )
+            os.replace(partial_file, write_to)
+        except BaseException:
+            os.remove(partial_file)
+            raise
+
+    @classmethod
+    def load(cls, read_from, max_age=MAX_AGE, query_ttl=QUERY_TTL):
+        """Method to create an index from a file written by save().
+
+        :param read_from: File/Path to read the index from.
+        :param max_age: Seconds after which the index is considered stale.
+        :param query_ttl: Seconds after their last request beyond which
+                          queries are not crawled.
+        :return: CandidateIndex populated with the persisted repositories.
+        """
+        index = cls(max_age=max_age, query_ttl=query_ttl)
+
+        with open(read_from, "r") as readfile:
+            data = json.load(readfile)
+
+        index.repos = dict(
+            (repo[0], IndexedRepository(*repo)) for repo in data["repos"]
+        )
+        index.postings = CandidateIndex.get_postings(index.repos.values())
+        index.queries = data["queries"]
+        index.requested = data["requested"]
+        index.built_at = data["built_at"]
+
+        return index
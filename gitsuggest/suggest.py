@@ -8,6 +8,8 @@ This module contains the primary objects that power GitSuggest.
 """
 
 import itertools
+import shutil
+import tempfile
 from collections import defaultdict
 from operator import attrgetter
 from os import path
@@ -17,6 +19,9 @@ from gensim import corpora, models
 from nltk.corpus import words, stopwords
 from nltk.tokenize import RegexpTokenizer
 
+from .cache import TokenCache
+from .client import StageBudget, get_client_options
+
 
 class GitSuggest(object):
     """Class to suggest git repositories for a user."""
@@ -25,8 +30,24 @@ class GitSuggest(object):
     # that it is a spammy repository.
     MAX_DESC_LEN = 300
 
+    # Cache of cleaned description tokens shared by all instances, as popular
+    # repositories are of interest to a lot of users.
+    token_cache = TokenCache()
+
     def __init__(
-        self, username=None, password=None, token=None, deep_dive=False
+        self,
+        username=None,
+        password=None,
+        token=None,
+        deep_dive=False,
+        token_cache=None,
+        star_sync=None,
+        candidate_index=None,
+        timeout=None,
+        pool_size=None,
+        retries=None,
+        retry_deadline=None,
+        stage_timeout=None,
     ):
         """Constructor.
 
@@ -40,20 +61,61 @@ class GitSuggest(object):
         :param deep_dive: When set to True considers the repositories people
                           you follow have starred along with the ones you have
                           starred.
+        :param token_cache: TokenCache to use instead of the one shared by all
+                            instances.
+        :param star_sync: StarSync to incrementally fetch starred repositories
+                          with instead of fetching them all on every run.
+                          Starred repositories are then StarredRepository
+                          records with only full_name and description
+                          instead of github.Repository objects.
+        :param candidate_index: CandidateIndex to answer suggestion queries
+                                from before falling back to live search.
+        :param timeout: Seconds to wait for a connection and for each read
+                        from Github.
+        :param pool_size: Count of connections to Github kept open for
+                          concurrent calls.
+        :param retries: Count of retries on connection errors, 5xx responses
+                        and rate limits.
+        :param retry_deadline: Seconds after the first failure of a call to
+                               Github beyond which it is not retried anymore.
+        :param stage_timeout: Seconds each of populating repositories of
+                              interest and searching for suggestions may
+                              spend. Once past it, retries are cut short and
+                              the stage goes on with what it has fetched.
         """
+        if token_cache is not None:
+            self.token_cache = token_cache
+
+        # Time budget shared by Github calls of the stage in progress.
+        self.stage_timeout = stage_timeout
+        self.stage_budget = StageBudget()
+
+        # Options to tune the Github handle with.
+        client_options = get_client_options(
+            timeout=timeout,
+            pool_size=pool_size,
+            retries=retries,
+            retry_deadline=retry_deadline,
+            budget=self.stage_budget if stage_timeout is not None else None,
+        )
+
         if token:
-            self.github = github.Github(token)
+            self.github = github.Github(token, **client_options)
             username = self.github.get_user().login
             assert username is not None, "Invalid token"
         else:
             assert username is not None, "Suggest cannot work without username"
             # Github handle.
             if password is not None and password != "":
-                self.github = github.Github(username, password)
+                self.github = github.Github(
+                    username, password, **client_options
+                )
             else:
-                self.github = github.Github()
+                self.github = github.Github(**client_options)
 
         self.deep_dive = deep_dive
+        self.star_sync = star_sync
+        self.candidate_index = candidate_index
 
         # Populate repositories to be used for generating suggestions.
         self.user_starred_repositories = list()
@@ -122,18 +184,35 @@ class GitSuggest(object):
         :param username: Username for the user for whom repositories are being
                          suggested for.
         """
-        # Handle to the user to whom repositories need to be suggested.
-        user = self.github.get_user(username)
-
-        # Procure repositories starred by the user.
-        self.user_starred_repositories.extend(user.get_starred())
-
-        # Repositories starred by users followed by the user.
-        if self.deep_dive:
-            for following_user in user.get_following():
-                self.user_following_starred_repositories.extend(
-                    following_user.get_starred()
-                )
+        self.stage_budget.start(self.stage_timeout)
+        try:
+            # Handle to the user to whom repositories need to be suggested.
+            user = self.github.get_user(username)
+
+            # Procure repositories starred by the user.
+            self.user_starred_repositories.extend(self.__get_starred(user))
+
+            # Repositories starred by users followed by the user, for as many
+            # of them as the stage budget allows.
+            if self.deep_dive:
+                for following_user in user.get_following():
+                    if self.stage_budget.is_exhausted():
+                        break
+                    self.user_following_starred_repositories.extend(
+                        self.__get_starred(following_user)
+                    )
+        finally:
+            self.stage_budget.stop()
+
+    def __get_starred(self, user):
+        """Method to procure repositories starred by a user.
+
+        :param user: github.NamedUser whose starred repositories are needed.
+        :return: Iterable of repositories starred by the user.
+        """
+        if self.star_sync is not None:
+            return self.star_sync.get_starred(user)
+        return user.get_starred()
 
     def __get_interests(self):
         """Method to procure description of repositories the authenticated user
@@ -202,17 +281,27 @@ class GitSuggest(object):
 
         cleaned_doc_list = list()
 
-        # Regular expression to remove out all punctuations, numbers and other
-        # un-necessary text substrings like emojis etc.
-        tokenizer = RegexpTokenizer(r"[a-zA-Z]+")
+        # Word lists are only loaded if a description is missing in cache.
+        tokenizer = None
 
-        # Get stop words.
-        stopwords = self.__get_words_to_ignore()
+        for doc in doc_list:
+            # Repeat descriptions cost only a cache lookup.
+            tokens = self.token_cache.get(doc)
+            if tokens is not None:
+                cleaned_doc_list.append(tokens)
+                continue
 
-        # Get english words.
-        dict_words = self.__get_words_to_consider()
+            if tokenizer is None:
+                # Regular expression to remove out all punctuations, numbers
+                # and other un-necessary text substrings like emojis etc.
+                tokenizer = RegexpTokenizer(r"[a-zA-Z]+")
+
+                # Get stop words.
+                stopwords = self.__get_words_to_ignore()
+
+                # Get english words.
+                dict_words = self.__get_words_to_consider()
 
-        for doc in doc_list:
             # Lowercase doc.
             lower = doc.lower()
 
@@ -228,6 +317,7 @@ class GitSuggest(object):
             # Filter Nones if any are introduced.
             tokens = [tok for tok in tokens if tok is not None]
 
+            self.token_cache.put(doc, tokens)
             cleaned_doc_list.append(tokens)
 
         return cleaned_doc_list
@@ -259,12 +349,29 @@ class GitSuggest(object):
 
         # Setup LDA requisites.
         dictionary = corpora.Dictionary(cleaned_tokens)
-        corpus = [dictionary.doc2bow(text) for text in cleaned_tokens]
 
-        # Generate LDA model
-        self.lda_model = models.ldamodel.LdaModel(
-            corpus, num_topics=1, id2word=dictionary, passes=10
-        )
+        # Keep the bag of words corpus on disk in Matrix Market format and
+        # stream it while training, instead of holding a list of tuples per
+        # token in memory, as deep dive corpora can get large.
+        corpus_dir = tempfile.mkdtemp(prefix="gitsuggest")
+        try:
+            corpus_file = path.join(corpus_dir, "corpus.mm")
+            corpora.MmCorpus.serialize(
+                corpus_file,
+                (dictionary.doc2bow(text) for text in cleaned_tokens),
+            )
+            corpus = corpora.MmCorpus(corpus_file)
+
+            # Tokens are in the dictionary and corpus now, release them
+            # before training.
+            del cleaned_tokens
+
+            # Generate LDA model
+            self.lda_model = models.ldamodel.LdaModel(
+                corpus, num_topics=1, id2word=dictionary, passes=10
+            )
+        finally:
+            shutil.rmtree(corpus_dir)
 
     def __get_query_for_repos(self, term_count=5):
         """Method to procure query based on topics authenticated user is
@@ -287,6 +394,12 @@ class GitSuggest(object):
         :param query: String representing the repositories intend to search.
         :return: Iterator for repositories found using the query.
         """
+        # Queries covered by the local index cost no search quota.
+        if self.candidate_index is not None:
+            repos = self.candidate_index.search(query)
+            if repos is not None:
+                return repos
+
         return self.github.search_repositories(
             query, "stars", "desc"
         ).get_page(
@@ -299,11 +412,18 @@ class GitSuggest(object):
         :return: Iterator to procure suggested repositories for the user.
         """
         if self.suggested_repositories is None:
-            # Procure repositories to suggest to user.
+            # Procure repositories to suggest to user, with as many queries
+            # as the stage budget allows.
             repository_set = list()
-            for term_count in range(5, 2, -1):
-                query = self.__get_query_for_repos(term_count=term_count)
-                repository_set.extend(self.__get_repos_for_query(query))
+            self.stage_budget.start(self.stage_timeout)
+            try:
+                for term_count in range(5, 2, -1):
+                    if self.stage_budget.is_exhausted():
+                        break
+                    query = self.__get_query_for_repos(term_count=term_count)
+                    repository_set.extend(self.__get_repos_for_query(query))
+            finally:
+                self.stage_budget.stop()
 
             # Remove repositories authenticated user is already interested in.
             catchy_repos = GitSuggest.minus(
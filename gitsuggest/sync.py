@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.sync
+~~~~~~~~~~~~~~~
+
+This module contains code to incrementally sync repositories starred by users.
+"""
+
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+from os import makedirs, path
+
+# Lightweight record of a starred repository holding just what is needed to
+# generate suggestions.
+StarredRepository = namedtuple(
+    "StarredRepository", ["full_name", "description"]
+)
+
+
+class StarSync(object):
+    """Class to keep a local copy of repositories starred by users and refresh
+    it with only the stars added since the last sync.
+
+    Github lists starred repositories newest first, so the run of newest
+    repositories seen on the previous sync acts as a watermark: paging stops
+    as soon as that run is listed again and the new stars are merged on top of
+    the stored ones. Matching a run rather than a single repository keeps a
+    repository unstarred and starred again from hiding the stars made in
+    between. Stars removed by the user are only noticed by a full resync,
+    which happens once the stored copy is older than the resync interval.
+    """
+
+    # Count of newest repositories making up the watermark.
+    WATERMARK_LEN = 3
+
+    # Seconds after which the starred repositories are fetched in full again.
+    RESYNC_INTERVAL = 7 * 24 * 60 * 60
+
+    def __init__(self, sync_dir, resync_interval=RESYNC_INTERVAL):
+        """Constructor.
+
+        :param sync_dir: Directory to store starred repositories of users in.
+        :param resync_interval: Seconds after which a full resync is done.
+        """
+        self.sync_dir = sync_dir
+        self.resync_interval = resync_interval
+
+        if not path.isdir(sync_dir):
+            makedirs(sync_dir)
+
+    def __get_path(self, login):
+        """Method to procure the file storing starred repositories of a user.
+
+        :param login: Login of the user.
+        :return: Path of the file.
+        """
+        return path.join(self.sync_dir, "{}.json".format(login.lower()))
+
+    def __load(self, login):
+        """Method to load stored starred repositories of a user.
+
+        :param login: Login of the user.
+        :return: Dictionary with sync state or None if nothing is stored.
+        """
+        file_name = self.__get_path(login)
+        if not path.isfile(file_name):
+            return None
+
+        with open(file_name, "r") as readfile:
+            return json.load(readfile)
+
+    def __save(self, login, state):
+        """Method to store starred repositories of a user.
+
+        The file is replaced at once so that an interrupted save leaves the
+        previous state intact.
+
+        :param login: Login of the user.
+        :param state: Dictionary with sync state.
+        """
+        fd, partial_file = tempfile.mkstemp(
+            dir=self.sync_dir, suffix=".partial"
+        )
+        try:
+            with os.fdopen(fd, "w") as writefile:
+                json.dump(state, writefile)
+            os.replace(partial_file, self.__get_path(login))
+        except BaseException:
+            os.remove(partial_file)
+            raise
+
+    def get_starred(self, user):
+        """Method to procure repositories starred by the user, fetching only
+        the ones starred since the last sync where possible.
+
+        :param user: github.NamedUser whose starred repositories are needed.
+        :return: List of StarredRepository, newest star first.
+        """
+        now = time.time()
+        state = self.__load(user.login)
+
+        full_sync = (
+            state is None
+            or now - state["full_synced_at"] >= self.resync_interval
+        )
+        watermark = list() if full_sync else state["watermark"]
+
+        # Page through starred repositories until the watermark is reached.
+        new_repos = list()
+        for repo in user.get_starred():
+            new_repos.append([repo.full_name, repo.description])
+            if watermark and [
+                full_name for full_name, _ in new_repos[-len(watermark) :]
+            ] == watermark:
+                break
+
+        if full_sync:
+            repos = new_repos
+            full_synced_at = now
+        else:
+            # Repositories starred again move to the top of the listing.
+            included = set(full_name for full_name, _ in new_repos)
+            repos = new_repos + [
+                repo for repo in state["repos"] if repo[0] not in included
+            ]
+            full_synced_at = state["full_synced_at"]
+
+        self.__save(
+            user.login,
+            {
+                "watermark": [
+                    full_name
+                    for full_name, _ in repos[: StarSync.WATERMARK_LEN]
+                ],
+                "full_synced_at": full_synced_at,
+                "repos": repos,
+            },
+        )
+
+        return [
+            StarredRepository(full_name, description)
+            for full_name, description in repos
+        ]
@@ -58,7 +58,10 @@ setup(
     package_dir={"gitsuggest": "gitsuggest"},
     package_data={"gitsuggest": ["res/*", "gitlang/*"]},
     entry_points={
-        "console_scripts": ["gitsuggest=gitsuggest.commandline:main"]
+        "console_scripts": [
+            "gitsuggest=gitsuggest.commandline:main",
+            "gitsuggest-index=gitsuggest.commandline:build_index",
+        ]
     },
     test_suite="tests",
     keywords="github repository suggestion",
@@ -73,13 +76,17 @@ setup(
         # Operating Systems.
         "Operating System :: POSIX",
         # Supported Languages.
-        "Programming Language :: Python :: 2.7",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
         # Topic tags.
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
-    install_requires=["gensim", "PyGithub", "nltk", "crayons", "jinja2"],
+    python_requires=">=3.7",
+    install_requires=[
+        "gensim",
+        "PyGithub>=2.1.1",
+        "nltk",
+        "crayons",
+        "jinja2",
+    ],
     cmdclass={"develop": PostDevelop, "install": PostInstall},
 )
@@ -18,3 +18,64 @@ class MockRepo(object):
 
     def __eq__(self, other):
         return self.full_name == other.full_name and self.description == other.description
+
+
+class MockUser(object):
+    """MockClass to represent a Github NamedUser."""
+
+    def __init__(self, login, starred):
+        """Constructor.
+
+        :param login: Login of the user.
+        :param starred: List of repositories starred, newest first.
+        """
+        self.login = login
+        self.starred = starred
+        self.fetched = 0
+
+    def get_starred(self):
+        for repo in self.starred:
+            self.fetched += 1
+            yield repo
+
+    def get_following(self):
+        return []
+
+
+class MockGithub(object):
+    """MockClass to represent a Github handle."""
+
+    def __init__(self, search_results, user=None, default_results=None):
+        """Constructor.
+
+        :param search_results: Dictionary from query to list of repositories.
+        :param user: MockUser returned for user lookups.
+        :param default_results: List of repositories for other queries.
+        """
+        self.search_results = search_results
+        self.user = user
+        self.default_results = default_results or []
+        self.searches = []
+
+    def get_user(self, login=None):
+        return self.user
+
+    def search_repositories(self, query, sort, order):
+        self.searches.append(query)
+        return MockPaginatedList(
+            self.search_results.get(query, self.default_results)
+        )
+
+
+class MockPaginatedList(object):
+    """MockClass to represent a Github PaginatedList."""
+
+    def __init__(self, items):
+        """Constructor.
+
+        :param items: List of items in the first page.
+        """
+        self.items = items
+
+    def get_page(self, page):
+        return self.items if page == 0 else []
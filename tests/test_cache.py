@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.cache test
+~~~~~~~~~~
+
+Usage from git root:
+
+    >>> python setup.py test
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from gitsuggest import TokenCache
+
+
+class TokenCacheTest(unittest.TestCase):
+    """Class to test :class:`TokenCache` functionality."""
+
+    def test_get_put(self):
+        """Tests to validate get() and put()."""
+
+        cache = TokenCache()
+
+        self.assertIsNone(cache.get("A Desc"))
+        cache.put("A Desc", ["desc"])
+
+        self.assertEqual(("desc",), cache.get("A Desc"))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_eviction(self):
+        """Tests to validate least recently used entries are evicted."""
+
+        entry_size = TokenCache.get_entry_size(
+            TokenCache.get_key("A Desc"), ("desc",)
+        )
+        cache = TokenCache(max_bytes=2 * entry_size)
+
+        cache.put("A Desc", ["desc"])
+        cache.put("B Desc", ["desc"])
+        cache.get("A Desc")
+        cache.put("C Desc", ["desc"])
+
+        self.assertEqual(2, len(cache))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+        self.assertIsNotNone(cache.get("A Desc"))
+        self.assertIsNone(cache.get("B Desc"))
+        self.assertIsNotNone(cache.get("C Desc"))
+
+    def test_save_load(self):
+        """Tests to validate save() and load()."""
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(tmpdir, "tokens.json")
+
+            cache = TokenCache()
+            cache.put("A Desc", ["desc"])
+            cache.put("B Desc", [])
+            cache.save(file_name)
+
+            loaded = TokenCache.load(file_name)
+
+            self.assertEqual(2, len(loaded))
+            self.assertEqual(cache.size_bytes, loaded.size_bytes)
+            self.assertEqual(("desc",), loaded.get("A Desc"))
+            self.assertEqual((), loaded.get("B Desc"))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_save_interrupted(self):
+        """Tests to validate an interrupted save() keeps the previous file."""
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(tmpdir, "tokens.json")
+
+            cache = TokenCache()
+            cache.put("A Desc", ["desc"])
+            cache.save(file_name)
+
+            cache.put("B Desc", ["desc"])
+            with mock.patch(
+                "gitsuggest.cache.json.dump", side_effect=KeyboardInterrupt
+            ):
+                self.assertRaises(KeyboardInterrupt, cache.save, file_name)
+
+            self.assertEqual(["tokens.json"], os.listdir(tmpdir))
+            self.assertEqual(1, len(TokenCache.load(file_name)))
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.client test
+~~~~~~~~~~
+
+Usage from git root:
+
+    >>> python setup.py test
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from github import GithubRetry
+
+from gitsuggest.client import JitteredRetry, StageBudget, get_client_options
+
+
+class ClientTest(unittest.TestCase):
+    """Class to test :mod:`gitsuggest.client` functionality."""
+
+    def test_get_client_options(self):
+        """Tests to validate get_client_options()."""
+
+        self.assertEqual({}, get_client_options())
+
+        options = get_client_options(timeout=5, pool_size=8, retries=3)
+        self.assertEqual(5, options["timeout"])
+        self.assertEqual(8, options["pool_size"])
+        self.assertIsInstance(options["retry"], JitteredRetry)
+        self.assertEqual(3, options["retry"].total)
+
+        options = get_client_options(retry_deadline=2)
+        self.assertEqual(2, options["retry"].deadline)
+        self.assertEqual(GithubRetry().total, options["retry"].total)
+
+    def test_backoff_jitter(self):
+        """Tests to validate backoff stays within the exponential one."""
+
+        retry = JitteredRetry(total=5, backoff_factor=1).new(total=2)
+        retry = retry.new(total=1)
+        for _ in range(100):
+            self.assertGreaterEqual(retry.get_backoff_time(), 0)
+            self.assertLessEqual(retry.get_backoff_time(), 2)
+
+    def test_deadline(self):
+        """Tests to validate retries stop once the deadline passes."""
+
+        retry = JitteredRetry(deadline=10, total=5)
+        self.assertFalse(retry.is_exhausted())
+
+        retry = retry.new(total=4)
+        self.assertEqual(10, retry.deadline)
+        self.assertFalse(retry.is_exhausted())
+
+        retry = retry.new(total=3, started_at=time.time() - 10)
+        self.assertTrue(retry.is_exhausted())
+
+    def test_deadline_during_backoff(self):
+        """Tests to validate waits are cut short at the deadline."""
+
+        retry = JitteredRetry(deadline=1, started_at=time.time() - 0.5)
+        # Rate limit waits replace get_backoff_time() on the instance.
+        retry.get_backoff_time = lambda: 3600
+        with mock.patch("gitsuggest.client.time.sleep") as sleep:
+            retry.sleep()
+        self.assertLessEqual(sleep.call_args[0][0], 0.5)
+
+        response = mock.Mock()
+        response.headers = {"Retry-After": "3600"}
+        response.get_redirect_location.return_value = False
+        with mock.patch("gitsuggest.client.time.sleep") as sleep:
+            retry.sleep(response)
+        self.assertLessEqual(sleep.call_args[0][0], 0.5)
+
+        retry.started_at = time.time() - 1
+        with mock.patch("gitsuggest.client.time.sleep") as sleep:
+            retry.sleep()
+        sleep.assert_not_called()
+        self.assertTrue(retry.is_exhausted())
+
+    def test_stage_budget(self):
+        """Tests to validate retries stop once the stage budget runs out."""
+
+        budget = StageBudget()
+        retry = get_client_options(budget=budget)["retry"].new(total=3)
+        self.assertIsNone(budget.get_remaining())
+        self.assertFalse(retry.is_exhausted())
+
+        budget.start(10)
+        self.assertLessEqual(budget.get_remaining(), 10)
+        self.assertFalse(retry.is_exhausted())
+
+        budget.start(0)
+        self.assertTrue(budget.is_exhausted())
+        self.assertTrue(retry.is_exhausted())
+
+        budget.stop()
+        self.assertFalse(budget.is_exhausted())
+        self.assertFalse(retry.is_exhausted())
+
+
+if __name__ == "__main__":
+    unittest.main()
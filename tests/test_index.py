@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.index test
+~~~~~~~~~~
+
+Usage from git root:
+
+    >>> python setup.py test
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from github.GithubException import GithubException
+
+from gitsuggest import CandidateIndex
+from gitsuggest.index import IndexedRepository
+
+from .mockentities import MockGithub
+
+
+class CandidateIndexTest(unittest.TestCase):
+    """Class to test :class:`CandidateIndex` functionality."""
+
+    def setUp(self):
+        repo_b = IndexedRepository("userB/proB", "Parser toolkit", "Go", 50)
+        self.github = MockGithub(
+            {
+                "parser": [
+                    IndexedRepository("userA/proA", "Fast parser", "C", 10),
+                    repo_b,
+                ],
+                "toolkit": [
+                    repo_b,
+                    IndexedRepository("userC/proC", "Web toolkit", None, 5),
+                ],
+                "web toolkit": [
+                    IndexedRepository("userC/proC", "Web toolkit", None, 5),
+                ],
+            }
+        )
+        self.index = CandidateIndex()
+        self.index.crawl(self.github, ["parser", "Toolkit", "web  toolkit"])
+
+    def test_search(self):
+        """Tests to validate search() answers crawled queries locally."""
+
+        repos = self.index.search("parser")
+        self.assertEqual(
+            ["userB/proB", "userA/proA"], [r.full_name for r in repos]
+        )
+
+        repos = self.index.search("Web toolkit")
+        self.assertEqual(["userC/proC"], [r.full_name for r in repos])
+
+        self.assertEqual(
+            ["parser", "toolkit", "web toolkit"], self.github.searches
+        )
+
+    def test_search_not_covered(self):
+        """Tests to validate search() leaves queries it cannot answer with a
+        full page to live search and records all requests."""
+
+        # Terms crawled on their own but with less than a page in common.
+        self.assertIsNone(self.index.search("parser toolkit"))
+        self.assertIsNone(self.index.search("parser fast"))
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNotNone(self.index.search("parser"))
+        self.assertEqual(
+            set(["parser toolkit", "parser fast", "parser"]),
+            set(self.index.requests),
+        )
+
+        self.index.max_age = 0
+        self.assertIsNone(self.index.search("parser"))
+
+    def test_crawl_rebuild(self):
+        """Tests to validate crawl() drops repositories and terms which are
+        no longer in the crawled pages."""
+
+        self.github.search_results["parser"] = [
+            IndexedRepository("userB/proB", "Parser library", "Go", 60)
+        ]
+        self.index.crawl(self.github, ["parser"])
+
+        self.assertEqual(["parser"], list(self.index.queries))
+        self.assertEqual(["userB/proB"], list(self.index.repos))
+        self.assertNotIn("toolkit", self.index.postings)
+        self.assertIsNone(self.index.search("toolkit"))
+
+    def test_crawl_failure(self):
+        """Tests to validate a failed crawl() leaves the index as it was."""
+
+        queries = dict(self.index.queries)
+
+        with mock.patch.object(
+            self.github,
+            "search_repositories",
+            side_effect=GithubException(502, "Bad Gateway", None),
+        ):
+            self.assertRaises(
+                GithubException, self.index.crawl, self.github, ["parser"]
+            )
+        self.assertEqual(queries, self.index.queries)
+        self.assertIsNotNone(self.index.search("web toolkit"))
+
+    def test_queries_to_crawl(self):
+        """Tests to validate queries not requested recently are expired."""
+
+        now = time.time()
+        self.index.add_requests(
+            {
+                "Parser": now,
+                "web  toolkit": now - CandidateIndex.QUERY_TTL,
+                "": now,
+            }
+        )
+        self.index.add_requests({"parser": now - 1})
+
+        self.assertEqual(["parser"], self.index.get_queries_to_crawl())
+        self.assertEqual({"parser": now}, self.index.requested)
+
+    def test_save_load_requests(self):
+        """Tests to validate requests are appended to and read from a log."""
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(tmpdir, "index.json.requests")
+
+            self.index.search("parser")
+            self.index.save_requests(file_name)
+
+            other = CandidateIndex()
+            other.search("parser fast")
+            other.save_requests(file_name)
+
+            # Line cut short by an interrupted write.
+            with open(file_name, "a") as appendfile:
+                appendfile.write('[1, "parser')
+
+            requests = CandidateIndex.load_requests(file_name)
+            self.assertEqual(
+                dict(self.index.requests, **other.requests), requests
+            )
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_save_load(self):
+        """Tests to validate save() and load()."""
+
+        self.index.add_requests({"parser": time.time()})
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(tmpdir, "index.json")
+            self.index.save(file_name)
+
+            loaded = CandidateIndex.load(file_name)
+
+            self.assertEqual(self.index.queries, loaded.queries)
+            self.assertEqual(self.index.requested, loaded.requested)
+            self.assertEqual(self.index.repos, loaded.repos)
+            self.assertEqual(self.index.postings, loaded.postings)
+            self.assertEqual(
+                self.index.search("parser"), loaded.search("parser")
+            )
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,9 +12,12 @@ Usage from git root:
 
 import unittest
 
-from gitsuggest import GitSuggest
+from unittest import mock
 
-from .mockentities import MockRepo
+from gitsuggest import CandidateIndex, GitSuggest, TokenCache
+from gitsuggest.index import IndexedRepository
+
+from .mockentities import MockGithub, MockRepo, MockUser
 
 
 class GitSuggestTest(unittest.TestCase):
@@ -63,5 +66,120 @@ class GitSuggestTest(unittest.TestCase):
         self.assertEqual(expected_a_minus_b, a_minus_b)
 
 
+class GitSuggestModelTest(unittest.TestCase):
+    """Class to test :class:`GitSuggest` with a mocked Github handle."""
+
+    def setUp(self):
+        user = MockUser(
+            "userA",
+            [
+                MockRepo("userB/proB", "Fast web parser"),
+                MockRepo("userC/proC", "Parser toolkit"),
+                MockRepo("userD/proD", "Async http client library"),
+            ],
+        )
+        self.github = MockGithub({}, user=user)
+        patcher = mock.patch(
+            "gitsuggest.suggest.github.Github", return_value=self.github
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Word lists without needing nltk corpus downloads.
+        self.words_to_ignore = mock.Mock(return_value=set(["fast"]))
+        self.words_to_consider = mock.Mock(
+            return_value=set(
+                [
+                    "fast",
+                    "web",
+                    "parser",
+                    "toolkit",
+                    "async",
+                    "http",
+                    "client",
+                    "library",
+                ]
+            )
+        )
+        for name, word_list in [
+            ("_GitSuggest__get_words_to_ignore", self.words_to_ignore),
+            ("_GitSuggest__get_words_to_consider", self.words_to_consider),
+        ]:
+            patcher = mock.patch.object(GitSuggest, name, word_list)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_token_cache(self):
+        """Tests to validate repeat descriptions are served from cache."""
+
+        token_cache = TokenCache()
+
+        GitSuggest(username="userA", token_cache=token_cache)
+        self.assertEqual(0, token_cache.hits)
+        self.assertEqual(("web", "parser"), token_cache.get("Fast web parser"))
+        self.assertEqual(1, self.words_to_ignore.call_count)
+        self.assertEqual(1, self.words_to_consider.call_count)
+
+        GitSuggest(username="userA", token_cache=token_cache)
+        self.assertEqual(1 + 3, token_cache.hits)
+        # Word lists are not loaded when all descriptions are cached.
+        self.assertEqual(1, self.words_to_ignore.call_count)
+        self.assertEqual(1, self.words_to_consider.call_count)
+
+    def test_candidate_index(self):
+        """Tests to validate queries are answered from the candidate index
+        once crawled and from live search till then."""
+
+        repo = IndexedRepository("userE/proE", "Web parser", "Python", 7)
+        self.github.default_results = [repo]
+
+        # Terms crawled on their own do not answer multi term queries.
+        index = CandidateIndex()
+        index.crawl(self.github, ["web", "parser", "client"])
+        self.github.searches = []
+
+        gs = GitSuggest(
+            username="userA",
+            candidate_index=index,
+            token_cache=TokenCache(),
+        )
+        self.assertEqual([repo], list(gs.get_suggested_repositories()))
+        self.assertEqual(3, len(self.github.searches))
+        self.assertEqual(set(self.github.searches), set(index.requests))
+
+        # Crawl the queries which went to live search.
+        index.add_requests(index.requests)
+        index.crawl(self.github, index.get_queries_to_crawl())
+        self.github.searches = []
+
+        gs = GitSuggest(
+            username="userA",
+            candidate_index=index,
+            token_cache=TokenCache(),
+        )
+        self.assertEqual([repo], list(gs.get_suggested_repositories()))
+        self.assertEqual([], self.github.searches)
+
+    def test_stage_timeout(self):
+        """Tests to validate stages stop calling Github past their budget."""
+
+        repo = IndexedRepository("userE/proE", "Web parser", "Python", 7)
+        self.github.default_results = [repo]
+
+        gs = GitSuggest(
+            username="userA", stage_timeout=0, token_cache=TokenCache()
+        )
+        # Starred repositories of the user are fetched regardless.
+        self.assertEqual(3, len(gs.user_starred_repositories))
+        self.assertEqual([], list(gs.get_suggested_repositories()))
+        self.assertEqual([], self.github.searches)
+        self.assertIsNone(gs.stage_budget.get_remaining())
+
+        gs.stage_timeout = 60
+        gs.suggested_repositories = None
+        self.assertEqual([repo], list(gs.get_suggested_repositories()))
+        self.assertEqual(3, len(self.github.searches))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+gitsuggest.sync test
+~~~~~~~~~~
+
+Usage from git root:
+
+    >>> python setup.py test
+"""
+
+import shutil
+import tempfile
+import os
+import unittest
+from unittest import mock
+
+from gitsuggest import StarSync
+
+from .mockentities import MockRepo, MockUser
+
+
+class StarSyncTest(unittest.TestCase):
+    """Class to test :class:`StarSync` functionality."""
+
+    def setUp(self):
+        self.sync_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.sync_dir)
+
+    def test_delta_sync(self):
+        """Tests to validate only new stars are fetched after first sync."""
+
+        star_sync = StarSync(self.sync_dir)
+        user = MockUser(
+            "userA",
+            [
+                MockRepo("userB/proB", "B Desc"),
+                MockRepo("userC/proC", "C Desc"),
+            ],
+        )
+
+        starred = star_sync.get_starred(user)
+        self.assertEqual(
+            ["userB/proB", "userC/proC"], [r.full_name for r in starred]
+        )
+        self.assertEqual(2, user.fetched)
+
+        user.starred.insert(0, MockRepo("userD/proD", "D Desc"))
+        user.fetched = 0
+
+        starred = star_sync.get_starred(user)
+        self.assertEqual(
+            ["userD/proD", "userB/proB", "userC/proC"],
+            [r.full_name for r in starred],
+        )
+        self.assertEqual("D Desc", starred[0].description)
+        # Only the new star and the watermark are fetched.
+        self.assertEqual(1 + 2, user.fetched)
+
+    def test_restarred_watermark(self):
+        """Tests to validate stars made before a repository in the watermark
+        is starred again are not missed."""
+
+        star_sync = StarSync(self.sync_dir)
+        repo_b = MockRepo("userB/proB", "B Desc")
+        user = MockUser(
+            "userA",
+            [
+                repo_b,
+                MockRepo("userC/proC", "C Desc"),
+                MockRepo("userD/proD", "D Desc"),
+            ],
+        )
+        star_sync.get_starred(user)
+
+        # Unstar B, star E and star B again.
+        user.starred.remove(repo_b)
+        user.starred.insert(0, MockRepo("userE/proE", "E Desc"))
+        user.starred.insert(0, repo_b)
+
+        starred = star_sync.get_starred(user)
+        self.assertEqual(
+            ["userB/proB", "userE/proE", "userC/proC", "userD/proD"],
+            [r.full_name for r in starred],
+        )
+
+    def test_full_resync(self):
+        """Tests to validate unstarred repositories are dropped on resync."""
+
+        star_sync = StarSync(self.sync_dir, resync_interval=0)
+        user = MockUser(
+            "userA",
+            [
+                MockRepo("userB/proB", "B Desc"),
+                MockRepo("userC/proC", "C Desc"),
+            ],
+        )
+        star_sync.get_starred(user)
+
+        user.starred.pop()
+
+        starred = star_sync.get_starred(user)
+        self.assertEqual(["userB/proB"], [r.full_name for r in starred])
+
+    def test_save_interrupted(self):
+        """Tests to validate an interrupted save keeps the previous state."""
+
+        star_sync = StarSync(self.sync_dir)
+        user = MockUser("userA", [MockRepo("userB/proB", "B Desc")])
+        star_sync.get_starred(user)
+
+        user.starred.insert(0, MockRepo("userC/proC", "C Desc"))
+        with mock.patch(
+            "gitsuggest.sync.json.dump", side_effect=KeyboardInterrupt
+        ):
+            self.assertRaises(KeyboardInterrupt, star_sync.get_starred, user)
+
+        self.assertEqual(["usera.json"], os.listdir(self.sync_dir))
+        starred = star_sync.get_starred(user)
+        self.assertEqual(
+            ["userC/proC", "userB/proB"], [r.full_name for r in starred]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()